@@ -25,20 +25,38 @@ DNS Switcher (Portable) – Windows
 
 """
 
+import atexit
+import base64
 import ctypes
+import ipaddress
 import json
+import locale
 import os
+import queue
+import re
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
+try:
+    import orjson  # اختیاری؛ در صورت نصب بودن parse سریع‌تر
+except ImportError:
+    orjson = None
+
+# ماژول‌هایی که فقط در مسیر اعمال/fallback لازم‌اند (concurrent.futures، uuid، tempfile، winreg)
+# در محل استفاده import می‌شوند تا هزینه‌شان به هر بار اجرای برنامه اضافه نشود
+
 APP_NAME = "DNS Switcher"
 HERE = Path(getattr(sys, '_MEIPASS', Path(__file__).resolve().parent))  # پشتیبانی از PyInstaller
 APP_DIR = Path(sys.executable).resolve().parent if getattr(sys, 'frozen', False) else HERE
 PROFILE_FILE = APP_DIR / "dns_profiles.json"
+LOG_MAX_LINES = 500  # خطوط قدیمی‌تر گزارش حذف می‌شوند تا ویجت بی‌نهایت بزرگ نشود
+ADAPTER_POLL_MS = 1000  # فاصله بررسی اعلان تغییرات شبکه؛ چند اعلان پشت‌سرهم یک بار به‌روزرسانی می‌شوند
 
 # پروفایل‌های پیش‌فرض
 DEFAULT_PROFILES = {
@@ -70,23 +88,357 @@ def relaunch_as_admin():
         messagebox.showerror(APP_NAME, f"عدم موفقیت در ارتقا دسترسی به ادمین:\n{e}")
 
 
+# جلوگیری از باز شدن پنجره کنسول برای هر subprocess در نسخه --noconsole
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
 def run(cmd: list[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(cmd, capture_output=True, text=True, shell=False)
+    """اجرای دستور؛ stdout/stderr به صورت bytes برمی‌گردند (برای متن از _out/_err استفاده کنید)."""
+    return subprocess.run(cmd, capture_output=True, shell=False, creationflags=CREATE_NO_WINDOW)
+
+
+def _oem_encoding() -> str:
+    try:
+        return f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+    except Exception:
+        return locale.getpreferredencoding(False)
+
+
+def _decode(data: bytes) -> str:
+    """خروجی ابزارها: ابتدا UTF-8 (خروجی PowerShell)، در غیر این صورت code page کنسول (OEM) مثل netsh."""
+    if data.isascii():
+        return data.decode("ascii")
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        try:
+            return data.decode(_oem_encoding(), errors="replace")
+        except LookupError:
+            return data.decode("utf-8", errors="replace")
+
+
+def _out(p: subprocess.CompletedProcess) -> str:
+    return _decode(p.stdout or b"")
+
+
+def _err(p: subprocess.CompletedProcess) -> str:
+    return _decode(p.stderr or b"")
+
+
+class PSHost:
+    """یک powershell.exe ماندگار که دستورها را از stdin می‌خواند؛ هزینه راه‌اندازی CLR فقط یک بار."""
+
+    BEGIN = b"<<<BEGIN>>>"
+    END = b"<<<END>>>"
+    ERR = b"<<<ERR>>>"
+    TIMEOUT = 60  # ثانیه؛ پس از آن host کشته و در فراخوانی بعدی دوباره ساخته می‌شود
+
+    def __init__(self):
+        self.p = subprocess.Popen(
+            ["powershell", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass", "-Command", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,  # خطاها داخل خود اسکریپت به stdout هدایت می‌شوند
+            creationflags=CREATE_NO_WINDOW,
+        )
+        self._lock = threading.Lock()
+        # خواندن stdout در thread جدا تا بتوان برای پاسخ timeout گذاشت
+        self._lines: queue.Queue[bytes] = queue.Queue()
+        threading.Thread(target=self._pump, daemon=True).start()
+        self._send("[Console]::OutputEncoding = [Text.Encoding]::UTF8")
+
+    def _pump(self):
+        for raw in iter(self.p.stdout.readline, b""):
+            self._lines.put(raw)
+        self._lines.put(b"")  # EOF
+
+    def alive(self) -> bool:
+        return self.p.poll() is None
+
+    def _send(self, line: str):
+        self.p.stdin.write(line.encode("ascii") + b"\n")
+        self.p.stdin.flush()
+
+    def run(self, ps_code: str) -> subprocess.CompletedProcess:
+        """اجرای ps_code؛ OSError فقط وقتی که دستور اصلاً به host نرسیده باشد."""
+        # کد به صورت base64 فرستاده می‌شود تا چندخطی/غیر ASCII بودن آن مشکلی در خواندن خط‌به‌خط stdin ایجاد نکند
+        encoded = base64.b64encode(ps_code.encode("utf-8")).decode("ascii")
+        line = (
+            f"$__ok = $true; Write-Output '{self.BEGIN.decode()}'; "
+            "try { & ([scriptblock]::Create([Text.Encoding]::UTF8.GetString("
+            f"[Convert]::FromBase64String('{encoded}')))) 2>&1 | ForEach-Object {{ "
+            "if ($_ -is [Management.Automation.ErrorRecord]) "
+            f"{{ $__ok = $false; '{self.ERR.decode()}' + (\"$_\" -replace '\\s+', ' ') }} else {{ \"$_\" }} }} }} "
+            f"catch {{ $__ok = $false; '{self.ERR.decode()}' + (\"$_\" -replace '\\s+', ' ') }}; "
+            f"Write-Output ('{self.END.decode()}' + [int](-not $__ok))"
+        )
+        out: list[bytes] = []
+        err: list[bytes] = []
+        with self._lock:
+            self._send(line)
+            started = False
+            deadline = time.monotonic() + self.TIMEOUT
+            while True:
+                try:
+                    raw = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._abandon()
+                    err.append(b"PowerShell timeout")
+                    return subprocess.CompletedProcess(ps_code, 1, b"\n".join(out), b"\n".join(err))
+                if not raw:
+                    # host وسط اجرای دستور بسته شد؛ دوباره اجرا نمی‌کنیم چون ممکن است بخشی اعمال شده باشد
+                    self._abandon()
+                    err.append(b"PowerShell host exited")
+                    return subprocess.CompletedProcess(ps_code, 1, b"\n".join(out), b"\n".join(err))
+                raw = raw.rstrip(b"\r\n")
+                if raw.startswith(self.END):
+                    code = int(raw[len(self.END):] or 1)
+                    break
+                if not started:
+                    # هرچه قبل از BEGIN بیاید (مثلاً prompt) نادیده گرفته می‌شود
+                    started = raw == self.BEGIN
+                elif raw.startswith(self.ERR):
+                    err.append(raw[len(self.ERR):])
+                else:
+                    out.append(raw)
+        return subprocess.CompletedProcess(ps_code, code, b"\n".join(out), b"\n".join(err))
+
+    def _abandon(self):
+        """کشتن host تا alive() بلافاصله False شود و فراخوانی بعدی host تازه بسازد."""
+        self.p.kill()
+        try:
+            self.p.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def close(self):
+        # منتظر دستور در جریان می‌مانیم؛ اگر طول کشید host کشته می‌شود و run نتیجه ناموفق برمی‌گرداند
+        if not self._lock.acquire(timeout=2):
+            self.p.kill()
+            return
+        try:
+            self._send("exit")
+            self.p.wait(timeout=2)
+        except Exception:
+            self.p.kill()
+        finally:
+            self._lock.release()
+
+
+_PS_HOST: dict = {"host": None}
+_PS_HOST_LOCK = threading.Lock()
+
+
+def close_ps_host():
+    with _PS_HOST_LOCK:
+        host, _PS_HOST["host"] = _PS_HOST["host"], None
+    if host is not None:
+        host.close()
 
 
 def run_powershell(ps_code: str) -> subprocess.CompletedProcess:
-    return run(["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_code])
+    try:
+        with _PS_HOST_LOCK:
+            host = _PS_HOST["host"]
+            if host is None or not host.alive():
+                host = _PS_HOST["host"] = PSHost()
+        return host.run(ps_code)
+    except OSError:
+        # host اجرا نشد یا نوشتن دستور در stdin ناموفق بود (دستور اجرا نشده)؛ اجرای تک‌باره مثل قبل
+        close_ps_host()
+        # خروجی UTF-8 تا مثل host ماندگار با _out قابل decode باشد
+        ps_code = "[Console]::OutputEncoding = [Text.Encoding]::UTF8; " + ps_code
+        return run(["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_code])
+
+
+# ---------- Win32 (iphlpapi) ----------
+AF_UNSPEC = 0
+GAA_FLAG_SKIP_ANYCAST = 0x2
+GAA_FLAG_SKIP_MULTICAST = 0x4
+GAA_FLAG_SKIP_DNS_SERVER = 0x8
+ERROR_BUFFER_OVERFLOW = 111
+ERROR_NO_DATA = 232
+IF_OPER_STATUS_UP = 1
+IF_MAX_STRING_SIZE = 256
+IF_MAX_PHYS_ADDRESS_LENGTH = 32
+IF_FLAG_HARDWARE_INTERFACE = 0x1  # اولین bit از InterfaceAndOperStatusFlags
+
+
+class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    pass  # فقط فیلدهای ابتدایی ساختار که لازم داریم تعریف شده‌اند
+
+
+IP_ADAPTER_ADDRESSES._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("IfIndex", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.c_void_p),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.c_void_p),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * 8),
+    ("PhysicalAddressLength", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Mtu", ctypes.c_ulong),
+    ("IfType", ctypes.c_ulong),
+    ("OperStatus", ctypes.c_int),
+]
+
+
+class GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", ctypes.c_uint32),
+        ("Data2", ctypes.c_uint16),
+        ("Data3", ctypes.c_uint16),
+        ("Data4", ctypes.c_ubyte * 8),
+    ]
+
+
+class MIB_IF_ROW2(ctypes.Structure):
+    _fields_ = [
+        ("InterfaceLuid", ctypes.c_uint64),
+        ("InterfaceIndex", ctypes.c_ulong),
+        ("InterfaceGuid", GUID),
+        ("Alias", ctypes.c_wchar * (IF_MAX_STRING_SIZE + 1)),
+        ("Description", ctypes.c_wchar * (IF_MAX_STRING_SIZE + 1)),
+        ("PhysicalAddressLength", ctypes.c_ulong),
+        ("PhysicalAddress", ctypes.c_ubyte * IF_MAX_PHYS_ADDRESS_LENGTH),
+        ("PermanentPhysicalAddress", ctypes.c_ubyte * IF_MAX_PHYS_ADDRESS_LENGTH),
+        ("Mtu", ctypes.c_ulong),
+        ("Type", ctypes.c_ulong),
+        ("TunnelType", ctypes.c_int),
+        ("MediaType", ctypes.c_int),
+        ("PhysicalMediumType", ctypes.c_int),
+        ("AccessType", ctypes.c_int),
+        ("DirectionType", ctypes.c_int),
+        ("InterfaceAndOperStatusFlags", ctypes.c_ubyte),
+        ("OperStatus", ctypes.c_int),
+        ("AdminStatus", ctypes.c_int),
+        ("MediaConnectState", ctypes.c_int),
+        ("NetworkGuid", GUID),
+        ("ConnectionType", ctypes.c_int),
+        ("Counters", ctypes.c_uint64 * 20),  # TransmitLinkSpeed … OutQLen؛ استفاده نمی‌شوند
+    ]
+
+
+class MIB_IF_TABLE2(ctypes.Structure):
+    _fields_ = [("NumEntries", ctypes.c_ulong), ("Table", MIB_IF_ROW2 * 1)]
+
+
+def _hardware_interface_aliases() -> set[str]:
+    """نام اینترفیس‌هایی که HardwareInterface هستند (همان معیار Get-NetAdapter)."""
+    table = ctypes.POINTER(MIB_IF_TABLE2)()
+    ret = ctypes.windll.iphlpapi.GetIfTable2(ctypes.byref(table))
+    if ret != 0:
+        raise ctypes.WinError(ret)
+    try:
+        count = table.contents.NumEntries
+        rows = ctypes.cast(ctypes.addressof(table.contents.Table), ctypes.POINTER(MIB_IF_ROW2 * count)).contents
+        return {row.Alias for row in rows if row.InterfaceAndOperStatusFlags & IF_FLAG_HARDWARE_INTERFACE}
+    finally:
+        ctypes.windll.iphlpapi.FreeMibTable(table)
+
+
+def _iter_adapter_addresses():
+    """پیمایش لیست پیوندی IP_ADAPTER_ADDRESSES از GetAdaptersAddresses."""
+    flags = GAA_FLAG_SKIP_ANYCAST | GAA_FLAG_SKIP_MULTICAST | GAA_FLAG_SKIP_DNS_SERVER
+    size = ctypes.c_ulong(15 * 1024)
+    for _ in range(3):
+        buf = ctypes.create_string_buffer(size.value)
+        ret = ctypes.windll.iphlpapi.GetAdaptersAddresses(AF_UNSPEC, flags, None, buf, ctypes.byref(size))
+        if ret != ERROR_BUFFER_OVERFLOW:
+            break
+    if ret == ERROR_NO_DATA:
+        return
+    if ret != 0:
+        raise ctypes.WinError(ret)
+    node = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+    while node:
+        yield node.contents
+        node = node.contents.Next
+
+
+def _get_active_adapters_native() -> list[str]:
+    """آداپتورهای سخت‌افزاری در حالت Up، مستقیم از Win32 API (بدون اجرای PowerShell).
+
+    مثل فیلتر HardwareInterface در Get-NetAdapter؛ اینترفیس‌های مجازی (مثل vEthernet هایپر-V/WSL
+    یا host-only) با وجود IfType اترنت کنار گذاشته می‌شوند.
+    """
+    hardware = _hardware_interface_aliases()
+    return [
+        a.FriendlyName
+        for a in _iter_adapter_addresses()
+        if a.OperStatus == IF_OPER_STATUS_UP and a.FriendlyName in hardware
+    ]
+
+
+# خروجی netsh interface show interface:  Admin State  State  Type  Interface Name
+# نام اینترفیس انتهای خط است و می‌تواند فاصله داشته باشد
+# روی bytes کار می‌کند؛ فقط نام اینترفیس decode می‌شود
+_NETSH_RE = re.compile(rb"^\s*(?P<admin>\S+)\s+(?P<state>\S+)\s+(?P<type>\S+)\s+(?P<name>.+?)\s*$")
+
+
+# اعلان تغییرات شبکه ویندوز؛ callback فقط شمارنده را زیاد می‌کند و App با تایمر Tk آن را بررسی می‌کند
+_ADAPTER_WATCH: dict = {"gen": 0, "handle": None, "callback": None}
+
+
+def adapter_change_count() -> int:
+    """تعداد اعلان‌های تغییر اینترفیس از زمان ثبت؛ تغییر آن یعنی لیست آداپتورها باید دوباره خوانده شود."""
+    return _ADAPTER_WATCH["gen"]
+
+
+def _on_adapter_change():
+    _ADAPTER_WATCH["gen"] += 1
+
+
+def watch_adapter_changes() -> bool:
+    """ثبت NotifyIpInterfaceChange تا با هر تغییر شبکه adapter_change_count زیاد شود."""
+    if _ADAPTER_WATCH["handle"] is not None:
+        return True
+    try:
+        prototype = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)
+        # callback روی thread سیستم اجرا می‌شود؛ عمداً به Tk دست نمی‌زنیم چون
+        # CancelMibChangeNotify2 تا پایان callbackهای در جریان منتظر می‌ماند.
+        callback = prototype(lambda context, row, kind: _on_adapter_change())
+        handle = ctypes.c_void_p()
+        ret = ctypes.windll.iphlpapi.NotifyIpInterfaceChange(AF_UNSPEC, callback, None, False, ctypes.byref(handle))
+    except Exception:
+        return False
+    if ret != 0:
+        return False
+    _ADAPTER_WATCH.update(handle=handle, callback=callback)
+    # خروج از مسیرهایی غیر از بستن پنجره (مثل sys.exit در relaunch_as_admin) هم اشتراک را لغو کند
+    atexit.register(unwatch_adapter_changes)
+    return True
+
+
+def unwatch_adapter_changes():
+    handle = _ADAPTER_WATCH["handle"]
+    if handle is None:
+        return
+    try:
+        ctypes.windll.iphlpapi.CancelMibChangeNotify2(handle)
+    except Exception:
+        pass
+    _ADAPTER_WATCH.update(handle=None, callback=None)
 
 
 def get_active_adapters() -> list[str]:
-    """برگشت نام آداپتورهای فیزیکی فعال (Up)"""
-    ps = (
-        "Get-NetAdapter | Where-Object { $_.Status -eq 'Up' -and -not $_.Virtual -and $_.HardwareInterface } "
-        "| Select-Object -ExpandProperty Name"
-    )
-    p = run_powershell(ps)
+    """برگشت نام آداپتورهای فیزیکی فعال (Up)."""
+    try:
+        names = _get_active_adapters_native()
+        if names:
+            return names
+    except Exception:
+        pass
+    # PowerShell فقط در صورت شکست فراخوانی مستقیم Win32
+    p = run_powershell(_PS_GET_ADAPTERS)
     if p.returncode == 0:
-        names = [line.strip() for line in p.stdout.splitlines() if line.strip()]
+        names = [line.strip() for line in _out(p).splitlines() if line.strip()]
         if names:
             return names
     # تلاش جایگزین با netsh (در صورت عدم دسترسی به PowerShell cmdlets)
@@ -94,20 +446,66 @@ def get_active_adapters() -> list[str]:
     names = []
     if p.returncode == 0:
         for line in p.stdout.splitlines():
-            # خروجی netsh معمولاً شامل: Admin State  State   Type     Interface Name
-            if line.strip() and not line.startswith("Admin State") and not line.startswith("---"):
-                parts = [x for x in line.split(" ") if x]
-                # نام اینترفیس انتهای خط است
-                if len(parts) >= 4:
-                    state = parts[-3]
-                    name = " ".join(parts[3:])  # امن‌تر برای نام‌های با فاصله
-                    if state.lower() == "connected":
-                        names.append(name)
+            # خطوط عنوان و جداکننده یا match نمی‌شوند یا state آن‌ها connected نیست
+            m = _NETSH_RE.match(line)
+            if m and m.group("state").lower() == b"connected":
+                names.append(_decode(m.group("name")))
     return names
 
 
+# PowerShell علاوه بر ' نقل‌قول‌های تکی یونیکد (‘ ’ ‚ ‛) را هم پایان رشته می‌داند
+_PS_QUOTE_ESCAPES = str.maketrans({c: c * 2 for c in "'\u2018\u2019\u201a\u201b"})
+
+
+def _ps_quote(value: str) -> str:
+    """رشته را به صورت literal تک‌کوتیشنی PowerShell برمی‌گرداند (هر نقل‌قول تکی دوبار تکرار می‌شود)."""
+    return "'" + value.translate(_PS_QUOTE_ESCAPES) + "'"
+
+
+def _ps_array(values: list[str]) -> str:
+    return "@(" + ",".join(_ps_quote(v) for v in values) + ")"
+
+
+# قالب‌های ثابت PowerShell؛ در زمان اجرا فقط placeholderهای __X__ جایگزین می‌شوند
+# تا شکل اسکریپت بین فراخوانی‌ها (و در host ماندگار) یکسان بماند.
+_PS_FOREACH_ADAPTER = (
+    "$adapters = __ADAPTERS__; "
+    "for ($i = 0; $i -lt $adapters.Count; $i++) { "
+    "$a = $adapters[$i]; "
+    "try { __ACTION__ -ErrorAction Stop; Write-Output \"OK:$i\" } "
+    "catch { Write-Output (\"ERR:${i}:\" + ($_.Exception.Message -replace '\\s+', ' ')) } "
+    "}"
+)
+_PS_SET_DNS = "$servers = __SERVERS__; " + _PS_FOREACH_ADAPTER.replace(
+    "__ACTION__", "Set-DnsClientServerAddress -InterfaceAlias $a -ServerAddresses $servers"
+)
+_PS_RESET_DNS = _PS_FOREACH_ADAPTER.replace(
+    "__ACTION__", "Set-DnsClientServerAddress -InterfaceAlias $a -ResetServerAddresses"
+)
+_PS_GET_ADAPTERS = (
+    "Get-NetAdapter | Where-Object { $_.Status -eq 'Up' -and -not $_.Virtual -and $_.HardwareInterface } "
+    "| Select-Object -ExpandProperty Name"
+)
+
+
+def run_powershell_per_adapter(adapters: list[str], script: str) -> list[tuple[bool, str]]:
+    """اجرای یکی از قالب‌های _PS_FOREACH_ADAPTER برای همه آداپتورها؛ برای هر آداپتور (ok, خطا)."""
+    # نام آداپتورها آخر از همه جایگزین می‌شوند تا محتوای آن‌ها دوباره پردازش نشود
+    p = run_powershell(script.replace("__ADAPTERS__", _ps_array(adapters)))
+    results: dict[int, tuple[bool, str]] = {}
+    # خروجی با اندیس آداپتور برچسب خورده تا به encoding نام‌ها وابسته نباشیم
+    for line in _out(p).splitlines():
+        status, _, rest = line.strip().partition(":")
+        idx, _, msg = rest.partition(":")
+        if status in ("OK", "ERR") and idx.isdigit():
+            results[int(idx)] = (status == "OK", msg.strip())
+    # اگر خود PowerShell اجرا نشد، برای آداپتورهای بدون نتیجه stderr را گزارش می‌کنیم
+    missing = (False, _err(p).strip() or f"خروجی نامعتبر از PowerShell (کد {p.returncode})")
+    return [results.get(i, missing) for i in range(len(adapters))]
+
+
 def set_dns_servers(adapters: list[str], servers_v4: list[str] | None, servers_v6: list[str] | None) -> tuple[bool, str]:
-    """اعمال DNS برای آداپتورها. ابتدا PowerShell، در صورت خطا netsh برای IPv4."""
+    """اعمال DNS برای آداپتورها. ابتدا PowerShell، در صورت خطا SetInterfaceDnsSettings و در نهایت netsh برای IPv4."""
     logs: list[str] = []
     all_ok = True
 
@@ -116,98 +514,285 @@ def set_dns_servers(adapters: list[str], servers_v4: list[str] | None, servers_v
     if servers_v6 is None:
         servers_v6 = []
 
+    # اگر لیست خالی بود کاری نکنیم
+    if not (servers_v4 or servers_v6):
+        return all_ok, ""
+
     # تلاش با PowerShell (بهترین روش – یکجا هر دو نسخه را ست می‌کند)
+    # همه آداپتورها در یک اجرای powershell.exe تا هزینه راه‌اندازی فقط یک بار پرداخت شود
+    all_servers = servers_v4 + servers_v6
+    failed = list(adapters)
     try:
-        for adapter in adapters:
-            if servers_v4 or servers_v6:
-                # Set-DnsClientServerAddress با هر دو خانواده کار می‌کند
-                all_servers = servers_v4 + servers_v6
-                ps = (
-                    f"$ErrorActionPreference='Stop'; "
-                    f"Set-DnsClientServerAddress -InterfaceAlias \"{adapter}\" -ServerAddresses @('{"','".join(all_servers)}')"
-                )
-            else:
-                # اگر لیست خالی بود کاری نکنیم
-                continue
-            p = run_powershell(ps)
-            if p.returncode != 0:
+        results = run_powershell_per_adapter(adapters, _PS_SET_DNS.replace("__SERVERS__", _ps_array(all_servers)))
+        failed = []
+        for adapter, (ok, err) in zip(adapters, results):
+            if not ok:
                 all_ok = False
-                logs.append(f"[PowerShell] {adapter}: خطا در تنظیم DNS\n{p.stderr.strip()}")
+                failed.append(adapter)
+                logs.append(f"[PowerShell] {adapter}: خطا در تنظیم DNS\n{err}")
             else:
                 logs.append(f"[PowerShell] {adapter}: DNS با موفقیت اعمال شد → {', '.join(all_servers)}")
     except Exception as e:
         all_ok = False
         logs.append(f"[PowerShell] خطای غیرمنتظره: {e}")
 
-    # اگر PowerShell ناموفق بود، برای IPv4 از netsh استفاده کنیم
-    if not all_ok and servers_v4:
+    # اگر PowerShell ناموفق بود، مستقیم با Win32 API (بدون subprocess)
+    if failed:
+        logs.append("تلاش با SetInterfaceDnsSettings...")
+        nameservers = {4: servers_v4, 6: servers_v6}
+        failed, api_logs = _set_interface_dns(failed, {k: v for k, v in nameservers.items() if v})
+        logs.extend(api_logs)
+
+    # و در نهایت برای IPv4 از netsh استفاده کنیم
+    if failed and servers_v4:
         logs.append("تلاش با netsh برای IPv4...")
-        for adapter in adapters:
-            # ابتدا منبع را DHCP می‌کنیم تا لیست پاک شود
-            p1 = run(["netsh", "interface", "ipv4", "set", "dnsservers", f"name={adapter}", "source=dhcp"])
-            if p1.returncode != 0:
-                logs.append(f"[netsh] {adapter}: خطا در تنظیم DHCP IPv4 → {p1.stderr.strip()}")
-            # سپس Primary
-            p2 = run(["netsh", "interface", "ipv4", "set", "dnsservers", f"name={adapter}", "static", servers_v4[0], "primary"])
-            if p2.returncode != 0:
-                logs.append(f"[netsh] {adapter}: خطا در تنظیم DNS اولیه → {p2.stderr.strip()}")
-                continue
-            # و بقیه
-            for idx, ip in enumerate(servers_v4[1:], start=2):
-                p3 = run(["netsh", "interface", "ipv4", "add", "dnsservers", f"name={adapter}", ip, f"index={idx}"])
-                if p3.returncode != 0:
-                    logs.append(f"[netsh] {adapter}: خطا در افزودن DNS شماره {idx} → {p3.stderr.strip()}")
-            logs.append(f"[netsh] {adapter}: DNSهای IPv4 اعمال شد → {', '.join(servers_v4)}")
+        logs.extend(_netsh_set_ipv4(failed, servers_v4))
 
     return all_ok, "\n".join(logs)
 
 
+DNS_INTERFACE_SETTINGS_VERSION1 = 1
+DNS_SETTING_IPV6 = 0x1
+DNS_SETTING_NAMESERVER = 0x2
+
+
+class DNS_INTERFACE_SETTINGS(ctypes.Structure):
+    _fields_ = [
+        ("Version", ctypes.c_ulong),
+        ("Flags", ctypes.c_ulonglong),
+        ("Domain", ctypes.c_wchar_p),
+        ("NameServer", ctypes.c_wchar_p),
+        ("SearchList", ctypes.c_wchar_p),
+        ("RegistrationEnabled", ctypes.c_ulong),
+        ("RegisterAdapterName", ctypes.c_ulong),
+        ("EnableLLMNR", ctypes.c_ulong),
+        ("QueryAdapterName", ctypes.c_ulong),
+        ("ProfileNameServer", ctypes.c_wchar_p),
+    ]
+
+
+def get_adapter_guids() -> dict[str, str]:
+    """نگاشت نام آداپتور (FriendlyName) به GUID آن (فیلد AdapterName)."""
+    return {a.FriendlyName: a.AdapterName.decode("ascii") for a in _iter_adapter_addresses()}
+
+
+def _set_interface_dns(adapters: list[str], nameservers: dict[int, list[str]]) -> tuple[list[str], list[str]]:
+    """اعمال DNS هر خانواده (4/6) با SetInterfaceDnsSettings؛ (آداپتورهای ناموفق، گزارش).
+
+    این API (ویندوز 10 نسخه 2004 به بعد) برخلاف نوشتن مستقیم رجیستری، پشته TCP/IP و DNS Client را
+    هم مطلع می‌کند. لیست خالی یعنی بازگشت به DHCP. روی ویندوزهای قدیمی‌تر همه آداپتورها ناموفق
+    برمی‌گردند تا netsh اجرا شود.
+    """
+    import uuid
+
+    try:
+        set_dns = ctypes.windll.iphlpapi.SetInterfaceDnsSettings
+        guids = get_adapter_guids()
+    except Exception as e:
+        return list(adapters), [f"[Win32] SetInterfaceDnsSettings در دسترس نیست → {e}"]
+    set_dns.argtypes = [GUID, ctypes.POINTER(DNS_INTERFACE_SETTINGS)]
+    set_dns.restype = ctypes.c_ulong
+    failed: list[str] = []
+    logs: list[str] = []
+    for adapter in adapters:
+        guid = guids.get(adapter)
+        if not guid:
+            failed.append(adapter)
+            logs.append(f"[Win32] {adapter}: GUID آداپتور یافت نشد")
+            continue
+        interface = GUID.from_buffer_copy(uuid.UUID(guid).bytes_le)
+        for family, servers in nameservers.items():
+            settings = DNS_INTERFACE_SETTINGS(Version=DNS_INTERFACE_SETTINGS_VERSION1)
+            settings.Flags = DNS_SETTING_NAMESERVER | (DNS_SETTING_IPV6 if family == 6 else 0)
+            settings.NameServer = ",".join(servers)
+            ret = set_dns(interface, ctypes.byref(settings))
+            if ret != 0:
+                failed.append(adapter)
+                logs.append(f"[Win32] {adapter}: خطا در تنظیم DNS IPv{family} → {ctypes.FormatError(ret)}")
+                break
+        else:
+            servers = [ip for lst in nameservers.values() for ip in lst]
+            logs.append(f"[Win32] {adapter}: DNS اعمال شد → {', '.join(servers) if servers else 'DHCP'}")
+    if len(failed) < len(adapters):
+        try:
+            ctypes.windll.dnsapi.DnsFlushResolverCache()
+        except Exception:
+            pass
+    return failed, logs
+
+
+def run_netsh_script(commands: list[str]) -> subprocess.CompletedProcess:
+    """اجرای چند دستور netsh با یک بار اجرای netsh -f به جای یک process برای هر دستور."""
+    import tempfile
+
+    # UTF-16 با BOM تا نام‌هایی که در code page ویندوز (ANSI) نیستند به ? تبدیل نشوند
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-16") as f:
+        f.write("\n".join(commands) + "\n")
+    try:
+        return run(["netsh", "-f", f.name])
+    finally:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+
+
+TCPIP_INTERFACES_KEY = r"SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Interfaces"
+
+
+def _ipv4_nameservers(adapters: list[str]) -> dict[str, list[str] | None]:
+    """DNSهای IPv4 ثابت هر آداپتور از رجیستری (لیست خالی یعنی DHCP؛ None یعنی قابل خواندن نیست)."""
+    result: dict[str, list[str] | None] = {adapter: None for adapter in adapters}
+    try:
+        import winreg
+        guids = get_adapter_guids()
+    except Exception:
+        return result
+    for adapter in adapters:
+        guid = guids.get(adapter)
+        if not guid:
+            continue
+        try:
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, f"{TCPIP_INTERFACES_KEY}\\{guid}") as key:
+                value, _ = winreg.QueryValueEx(key, "NameServer")
+        except OSError:
+            continue
+        result[adapter] = [ip for ip in re.split(r"[,\s]+", value) if ip]
+    return result
+
+
+def _netsh_confirm(adapters: list[str], expected: list[str], p: subprocess.CompletedProcess) -> list[tuple[str, bool]]:
+    """نتیجه هر آداپتور پس از netsh -f؛ کد خروج یک اسکریپت به تنهایی قابل نسبت دادن به آداپتورها نیست.
+
+    در صورت امکان مقدار واقعی از رجیستری با expected مقایسه می‌شود؛ وگرنه فقط وقتی موفق است
+    که netsh هیچ خروجی (پیام خطا) نداده باشد.
+    """
+    clean = p.returncode == 0 and not (_out(p).strip() or _err(p).strip())
+    actual = _ipv4_nameservers(adapters)
+    return [(adapter, clean if actual[adapter] is None else actual[adapter] == expected) for adapter in adapters]
+
+
+def _netsh_set_ipv4(adapters: list[str], servers_v4: list[str]) -> list[str]:
+    commands: list[str] = []
+    for adapter in adapters:
+        # ابتدا منبع را DHCP می‌کنیم تا لیست پاک شود، سپس Primary و بقیه
+        # (validate=no از تست کندِ دسترسی به هر سرور DNS صرف‌نظر می‌کند)
+        commands.append(f'interface ipv4 set dnsservers name="{adapter}" source=dhcp')
+        commands.append(
+            f'interface ipv4 set dnsservers name="{adapter}" source=static address={servers_v4[0]} register=primary validate=no'
+        )
+        for idx, ip in enumerate(servers_v4[1:], start=2):
+            commands.append(f'interface ipv4 add dnsservers name="{adapter}" address={ip} index={idx} validate=no')
+    p = run_netsh_script(commands)
+    output = (_err(p) or _out(p)).strip()
+    return [
+        f"[netsh] {adapter}: DNSهای IPv4 اعمال شد → {', '.join(servers_v4)}"
+        if ok
+        else f"[netsh] {adapter}: خطا در تنظیم DNS IPv4 → {output or f'کد {p.returncode}'}"
+        for adapter, ok in _netsh_confirm(adapters, servers_v4, p)
+    ]
+
+
+def _netsh_reset_ipv4(adapters: list[str]) -> list[str]:
+    p = run_netsh_script([f'interface ipv4 set dnsservers name="{adapter}" source=dhcp' for adapter in adapters])
+    output = (_err(p) or _out(p)).strip()
+    return [
+        f"[netsh] {adapter}: IPv4 به DHCP بازگردانی شد"
+        if ok
+        else f"[netsh] {adapter}: خطا در DHCP IPv4 → {output or f'کد {p.returncode}'}"
+        for adapter, ok in _netsh_confirm(adapters, [], p)
+    ]
+
+
 def reset_dns(adapters: list[str]) -> tuple[bool, str]:
     """بازگردانی به حالت پیش‌فرض (DHCP) برای هر دو خانواده."""
     logs: list[str] = []
     all_ok = True
 
-    # PowerShell – بهترین روش
-    for adapter in adapters:
-        ps = (
-            f"$ErrorActionPreference='Stop'; "
-            f"Set-DnsClientServerAddress -InterfaceAlias \"{adapter}\" -ResetServerAddresses"
-        )
-        p = run_powershell(ps)
-        if p.returncode != 0:
+    # PowerShell – بهترین روش (یک اجرا برای همه آداپتورها)
+    results = run_powershell_per_adapter(adapters, _PS_RESET_DNS)
+    failed: list[str] = []
+    for adapter, (ok, err) in zip(adapters, results):
+        if not ok:
             all_ok = False
-            logs.append(f"[PowerShell] {adapter}: خطا در ریست DNS → {p.stderr.strip()}")
+            failed.append(adapter)
+            logs.append(f"[PowerShell] {adapter}: خطا در ریست DNS → {err}")
         else:
             logs.append(f"[PowerShell] {adapter}: DNS به حالت DHCP بازگردانی شد")
 
-    # اگر PowerShell موفق نبود، لااقل IPv4 را با netsh به DHCP برگردانیم
-    if not all_ok:
+    # اگر PowerShell موفق نبود، NameServer هر دو خانواده را با Win32 API خالی کنیم (یعنی DHCP)
+    if failed:
+        logs.append("تلاش با SetInterfaceDnsSettings (Reset)...")
+        failed, api_logs = _set_interface_dns(failed, {4: [], 6: []})
+        logs.extend(api_logs)
+
+    # در غیر این صورت لااقل IPv4 را با netsh به DHCP برگردانیم
+    if failed:
         logs.append("تلاش با netsh برای IPv4 (Reset)...")
-        for adapter in adapters:
-            p1 = run(["netsh", "interface", "ipv4", "set", "dnsservers", f"name={adapter}", "source=dhcp"])
-            if p1.returncode != 0:
-                logs.append(f"[netsh] {adapter}: خطا در DHCP IPv4 → {p1.stderr.strip()}")
-            else:
-                logs.append(f"[netsh] {adapter}: IPv4 به DHCP بازگردانی شد")
-            # IPv6 ریست fallback استاندارد مطمئن netsh ندارد، برای جلوگیری از رفتار ناخواسته صرف‌نظر می‌کنیم.
+        logs.extend(_netsh_reset_ipv4(failed))
+        # IPv6 ریست fallback استاندارد مطمئن netsh ندارد، برای جلوگیری از رفتار ناخواسته صرف‌نظر می‌کنیم.
 
     return all_ok, "\n".join(logs)
 
 
+def clean_servers(values: list, family: int) -> list[str]:
+    """فقط آدرس‌های معتبر خانواده داده‌شده (4 یا 6)، بدون تکرار و به شکل استاندارد."""
+    out: list[str] = []
+    for value in values:
+        try:
+            addr = ipaddress.ip_address(str(value).strip())
+        except ValueError:
+            continue
+        ip = str(addr)
+        if addr.version == family and ip not in out:
+            out.append(ip)
+    return out
+
+
+def _as_list(value) -> list:
+    """رشته تنها → لیست یک‌عضوی؛ هر مقدار غیر لیست دیگر نادیده گرفته می‌شود."""
+    if isinstance(value, str):
+        return [value]
+    return value if isinstance(value, list) else []
+
+
+# نتیجه آخرین خواندن dns_profiles.json بر اساس (mtime, size) فایل
+_PROFILE_CACHE: dict = {"key": None, "val": None}
+
+
+def _copy_profiles(profiles: dict) -> dict:
+    return {k: {"ipv4": list(v["ipv4"]), "ipv6": list(v["ipv6"])} for k, v in profiles.items()}
+
+
 def load_profiles() -> dict:
-    profiles = DEFAULT_PROFILES.copy()
-    if PROFILE_FILE.exists():
+    """پروفایل‌های پیش‌فرض + dns_profiles.json؛ فایل فقط در صورت تغییر دوباره parse می‌شود."""
+    try:
+        st = PROFILE_FILE.stat()
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    if _PROFILE_CACHE["val"] is not None and _PROFILE_CACHE["key"] == key:
+        return _copy_profiles(_PROFILE_CACHE["val"])
+
+    profiles = _copy_profiles(DEFAULT_PROFILES)
+    if key is not None:
         try:
-            with open(PROFILE_FILE, "r", encoding="utf-8") as f:
-                user_profiles = json.load(f)
-                # merge (کاربر اولویت دارد)
-                for k, v in user_profiles.items():
-                    ipv4 = v.get("ipv4", []) or []
-                    ipv6 = v.get("ipv6", []) or []
-                    profiles[k] = {"ipv4": ipv4, "ipv6": ipv6}
+            data = PROFILE_FILE.read_bytes()
+            # BOM فایل‌های ذخیره‌شده با Notepad؛ orjson برخلاف json آن را نمی‌پذیرد
+            data = data.removeprefix(b"\xef\xbb\xbf")
+            user_profiles = orjson.loads(data) if orjson is not None else json.loads(data)
+            # merge (کاربر اولویت دارد)
+            # آدرس‌ها بر اساس نوعشان جدا می‌شوند، حتی اگر IPv6 در ipv4 نوشته شده باشد
+            for k, v in user_profiles.items():
+                if not isinstance(v, dict):
+                    print(f"پروفایل نامعتبر در dns_profiles.json نادیده گرفته شد: {k}")
+                    continue
+                servers = _as_list(v.get("ipv4")) + _as_list(v.get("ipv6"))
+                profiles[k] = {"ipv4": clean_servers(servers, 4), "ipv6": clean_servers(servers, 6)}
         except Exception as e:
             print(f"خطا در خواندن dns_profiles.json: {e}")
-    return profiles
+    _PROFILE_CACHE.update(key=key, val=profiles)
+    return _copy_profiles(profiles)
 
 
 class App(tk.Tk):
@@ -219,13 +804,36 @@ class App(tk.Tk):
 
         self.profiles = load_profiles()
         self.adapters: list[str] = []
+        self._adapters_gen = adapter_change_count()
+        # اجرای عملیات کند (PowerShell/netsh) خارج از thread رابط کاربری؛ در اولین اعمال/ریست ساخته می‌شود
+        self._executor = None
+        self._pending: set = set()
+        self._closing = False
 
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.refresh_adapters()
+        if watch_adapter_changes():
+            self.after(ADAPTER_POLL_MS, self._poll_adapter_changes)
 
         if not is_admin():
             self.log("برنامه بدون دسترسی ادمین اجرا شده است. برای اعمال DNS نیاز به ارتقا دسترسی دارید.")
 
+    def _on_close(self):
+        # کشتن PowerShell وسط یک عملیات، fallbackها را پس از بسته شدن پنجره اجرا می‌کند؛
+        # پس پنجره پنهان می‌شود و بستن واقعی تا پایان عملیات در جریان صبر می‌کند
+        self._closing = True
+        self.withdraw()
+        if not self._pending:
+            self._shutdown()
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        unwatch_adapter_changes()
+        close_ps_host()
+        self.destroy()
+
     # ---------- UI ----------
     def _build_ui(self):
         container = ttk.Frame(self, padding=12)
@@ -250,7 +858,9 @@ class App(tk.Tk):
         profile_names = list(self.profiles.keys())
         if profile_names:
             self.profile_var.set(profile_names[0])
-        self.profile_combo = ttk.Combobox(prof_box, values=profile_names, textvariable=self.profile_var, state="readonly")
+        self.profile_combo = ttk.Combobox(
+            prof_box, values=profile_names, textvariable=self.profile_var, state="readonly", postcommand=self._reload_profiles
+        )
         self.profile_combo.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(8, 8), pady=8)
 
         ttk.Button(prof_box, text="باز کردن فایل پروفایل‌ها", command=self.open_profiles_file).pack(side=tk.RIGHT, padx=8, pady=8)
@@ -274,8 +884,10 @@ class App(tk.Tk):
         # Actions
         buttons = ttk.Frame(container)
         buttons.pack(fill=tk.X, pady=(4, 8))
-        ttk.Button(buttons, text="اعمال DNS انتخابی", command=self.apply_selected_profile).pack(side=tk.LEFT, padx=(0, 8))
-        ttk.Button(buttons, text="بازگردانی به حالت پیش‌فرض (DHCP)", command=self.reset_selected).pack(side=tk.LEFT)
+        self.apply_btn = ttk.Button(buttons, text="اعمال DNS انتخابی", command=self.apply_selected_profile)
+        self.apply_btn.pack(side=tk.LEFT, padx=(0, 8))
+        self.reset_btn = ttk.Button(buttons, text="بازگردانی به حالت پیش‌فرض (DHCP)", command=self.reset_selected)
+        self.reset_btn.pack(side=tk.LEFT)
 
         # Log
         log_box = ttk.LabelFrame(container, text="گزارش عملیات")
@@ -285,6 +897,11 @@ class App(tk.Tk):
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
         self.log_text.configure(state=tk.DISABLED)
 
+    def _reload_profiles(self):
+        """خواندن دوباره پروفایل‌ها (در صورت تغییر فایل) و به‌روزرسانی لیست کشویی."""
+        self.profiles = load_profiles()
+        self.profile_combo.configure(values=list(self.profiles.keys()))
+
     def _toggle_adapter_list(self):
         if self.all_adapters_var.get():
             self.adapter_list.configure(state=tk.DISABLED)
@@ -311,11 +928,33 @@ class App(tk.Tk):
             messagebox.showerror(APP_NAME, f"خطا در باز کردن فایل:\n{e}")
 
     def refresh_adapters(self):
+        # درخواست صریح کاربر همیشه دوباره می‌خواند؛ مثلاً تغییر نام آداپتور اعلانی ایجاد نمی‌کند
+        self._load_adapters()
+        self.log(f"آداپتورهای فعال: {', '.join(self.adapters) if self.adapters else '— هیچ —'}")
+
+    def _poll_adapter_changes(self):
+        """به‌روزرسانی خودکار لیست آداپتورها وقتی از آخرین خواندن اعلان تغییری رسیده باشد."""
+        if adapter_change_count() != self._adapters_gen:
+            old = self.adapters
+            self._load_adapters()
+            if self.adapters != old:
+                self.log(f"تغییر آداپتورها: {', '.join(self.adapters) if self.adapters else '— هیچ —'}")
+        self.after(ADAPTER_POLL_MS, self._poll_adapter_changes)
+
+    def _load_adapters(self):
+        # شمارنده قبل از پرس‌وجو خوانده می‌شود تا اعلانی که حین آن برسد از دست نرود
+        self._adapters_gen = adapter_change_count()
+        selected = {self.adapter_list.get(i) for i in self.adapter_list.curselection()}
         self.adapters = get_active_adapters()
+        # Listbox غیرفعال درج/حذف را نادیده می‌گیرد؛ موقتاً فعال می‌شود
+        state = self.adapter_list.cget("state")
+        self.adapter_list.configure(state=tk.NORMAL)
         self.adapter_list.delete(0, tk.END)
-        for name in self.adapters:
+        for i, name in enumerate(self.adapters):
             self.adapter_list.insert(tk.END, name)
-        self.log(f"آداپتورهای فعال: {', '.join(self.adapters) if self.adapters else '— هیچ —'}")
+            if name in selected:
+                self.adapter_list.selection_set(i)
+        self.adapter_list.configure(state=state)
 
     def _selected_adapters(self) -> list[str]:
         if self.all_adapters_var.get() or not self.adapters:
@@ -331,6 +970,7 @@ class App(tk.Tk):
             if messagebox.askyesno(APP_NAME, "برای اعمال DNS نیاز به دسترسی ادمین است. الان ارتقا دسترسی انجام شود؟"):
                 relaunch_as_admin()
             return
+        self._reload_profiles()
         name = self.profile_var.get()
         prof = self.profiles.get(name)
         if not prof:
@@ -339,9 +979,16 @@ class App(tk.Tk):
         adapters = self._selected_adapters()
         if not adapters:
             return
-        v4 = [ip for ip in (prof.get("ipv4") or []) if ip]
-        v6 = [ip for ip in (prof.get("ipv6") or []) if ip]
-        ok, log = set_dns_servers(adapters, v4, v6)
+        servers = (prof.get("ipv4") or []) + (prof.get("ipv6") or [])
+        v4 = clean_servers(servers, 4)
+        v6 = clean_servers(servers, 6)
+        if not (v4 or v6):
+            messagebox.showerror(APP_NAME, "پروفایل انتخابی هیچ آدرس DNS معتبری ندارد.")
+            return
+        self._submit(lambda fut: self._on_apply_done(fut, name, adapters), set_dns_servers, adapters, v4, v6)
+
+    def _on_apply_done(self, fut, name: str, adapters: list[str]):
+        ok, log = self._result(fut)
         self.log(f"اعمال پروفایل '{name}' روی: {', '.join(adapters)}\n{log}")
         if ok:
             messagebox.showinfo(APP_NAME, "DNS با موفقیت اعمال شد.")
@@ -356,17 +1003,61 @@ class App(tk.Tk):
         adapters = self._selected_adapters()
         if not adapters:
             return
-        ok, log = reset_dns(adapters)
+        self._submit(lambda fut: self._on_reset_done(fut, adapters), reset_dns, adapters)
+
+    def _on_reset_done(self, fut, adapters: list[str]):
+        ok, log = self._result(fut)
         self.log(f"بازگردانی DNS روی: {', '.join(adapters)}\n{log}")
         if ok:
             messagebox.showinfo(APP_NAME, "DNS به حالت پیش‌فرض بازگردانی شد.")
         else:
             messagebox.showwarning(APP_NAME, "برخی عملیات با خطا مواجه شد. گزارش را بررسی کنید.")
 
+    def _submit(self, on_done, func, *args):
+        """اجرای func در پس‌زمینه؛ on_done(future) روی thread رابط کاربری صدا زده می‌شود."""
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=2)
+        self._set_busy(True)
+
+        def done(fut):
+            try:
+                self.after(0, lambda: self._finish(fut, on_done))
+            except (tk.TclError, RuntimeError):
+                pass  # پنجره در این فاصله بسته شده است
+
+        fut = self._executor.submit(func, *args)
+        self._pending.add(fut)
+        fut.add_done_callback(done)
+
+    def _finish(self, fut, on_done):
+        self._pending.discard(fut)
+        if self._closing:
+            if not self._pending:
+                self._shutdown()
+            return
+        self._set_busy(False)
+        on_done(fut)
+
+    def _result(self, fut) -> tuple[bool, str]:
+        try:
+            return fut.result()
+        except Exception as e:
+            return False, f"خطای غیرمنتظره: {e}"
+
+    def _set_busy(self, busy: bool):
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.apply_btn.configure(state=state)
+        self.reset_btn.configure(state=state)
+
     def log(self, text: str):
         ts = datetime.now().strftime('%H:%M:%S')
         self.log_text.configure(state=tk.NORMAL)
         self.log_text.insert(tk.END, f"[{ts}] {text}\n")
+        count = int(self.log_text.index("end-1c").split(".")[0])
+        if count > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{count - LOG_MAX_LINES}.0")
         self.log_text.see(tk.END)
         self.log_text.configure(state=tk.DISABLED)
 